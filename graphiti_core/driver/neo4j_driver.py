@@ -59,11 +59,21 @@ class Neo4jDriver(GraphDriver):
         aws_profile_name: str | None = None,
         aws_region: str | None = None,
         aws_service: str | None = None,
+        max_connection_pool_size: int | None = None,
+        connection_acquisition_timeout: float | None = None,
     ):
         super().__init__()
+        # Only forward pool settings that were set, so the neo4j driver defaults apply otherwise
+        pool_config: dict[str, Any] = {}
+        if max_connection_pool_size is not None:
+            pool_config['max_connection_pool_size'] = max_connection_pool_size
+        if connection_acquisition_timeout is not None:
+            pool_config['connection_acquisition_timeout'] = connection_acquisition_timeout
+
         self.client = AsyncGraphDatabase.driver(
             uri=uri,
             auth=(user or '', password or ''),
+            **pool_config,
         )
         self._database = database
 
@@ -202,7 +202,16 @@ def get_entity_edge_return_query(provider: GraphProvider) -> str:
         properties(e) AS attributes
     """
 
-    return """
+    if provider == GraphProvider.KUZU:
+        attributes_query = 'e.attributes AS attributes'
+    elif provider == GraphProvider.NEO4J:
+        # Drop the embedding inside the projection so it is not sent over the wire just to be discarded
+        attributes_query = 'e {.*, fact_embedding: NULL} AS attributes'
+    else:
+        attributes_query = 'properties(e) AS attributes'
+
+    return (
+        """
         e.uuid AS uuid,
         n.uuid AS source_node_uuid,
         m.uuid AS target_node_uuid,
@@ -214,10 +223,8 @@ def get_entity_edge_return_query(provider: GraphProvider) -> str:
         e.expired_at AS expired_at,
         e.valid_at AS valid_at,
         e.invalid_at AS invalid_at,
-    """ + (
-        'e.attributes AS attributes'
-        if provider == GraphProvider.KUZU
-        else 'properties(e) AS attributes'
+    """
+        + attributes_query
     )
 
 
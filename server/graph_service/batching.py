@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import Iterable
+
+from graphiti_core.embedder import EmbedderClient  # type: ignore
+
+
+class BatchingEmbedder(EmbedderClient):
+    """Embedder wrapper that coalesces concurrent single-text `create` calls into one `create_batch`.
+
+    A batch is sent once `max_batch_size` texts are pending or `max_latency` seconds after the
+    first one arrived, whichever comes first. Explicit `create_batch` calls are split into requests
+    of at most `max_batch_size` texts.
+    """
+
+    def __init__(
+        self, embedder: EmbedderClient, max_batch_size: int = 64, max_latency: float = 0.01
+    ):
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._pending: list[tuple[str, asyncio.Future[list[float]]]] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        # Keep references to in-flight batches so they aren't garbage collected mid-request
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    async def create(
+        self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
+    ) -> list[float]:
+        if isinstance(input_data, str):
+            text = input_data
+        elif (
+            isinstance(input_data, list) and len(input_data) == 1 and isinstance(input_data[0], str)
+        ):
+            text = input_data[0]
+        else:
+            return await self.embedder.create(input_data)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.max_latency, self._flush)
+
+        return await future
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        # Explicit batches are split too, since providers cap the inputs per request (2048 for
+        # OpenAI) and callers such as POST /entity-nodes can pass arbitrarily many texts
+        embeddings: list[list[float]] = []
+        for start in range(0, len(input_data_list), self.max_batch_size):
+            embeddings.extend(
+                await self.embedder.create_batch(
+                    input_data_list[start : start + self.max_batch_size]
+                )
+            )
+        return embeddings
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._embed_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _embed_batch(self, batch: list[tuple[str, asyncio.Future[list[float]]]]):
+        # Every waiting caller must be resolved whatever goes wrong, or its create() never returns
+        try:
+            embeddings = await self.embedder.create_batch([text for text, _ in batch])
+            if len(embeddings) != len(batch):
+                raise ValueError(f'Expected {len(batch)} embeddings, got {len(embeddings)}')
+
+            for (_, future), embedding in zip(batch, embeddings, strict=True):
+                # The caller may have been cancelled while the batch was in flight
+                if not future.done():
+                    future.set_result(embedding)
+        except BaseException as e:
+            for _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
@@ -0,0 +1,238 @@
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from functools import lru_cache
+from typing import Annotated, Any
+
+import numpy as np
+from fastapi import Depends
+from graphiti_core.embedder import EmbedderClient  # type: ignore
+
+from graph_service.config import get_settings
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire `ttl` seconds after being stored.
+
+    Only used from the event loop, so no locking is needed. A `ttl` of None never expires entries;
+    a non-positive `ttl` or `maxsize` disables the cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Bumped whenever entries are removed, so callers that load a value across an await can
+        # tell whether an invalidation ran in the meantime before storing it
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0 or (self.ttl is not None and self.ttl <= 0):
+            return
+
+        expires_at = math.inf if self.ttl is None else time.monotonic() + self.ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self.invalidations += 1
+        self._entries.pop(key, None)
+
+    def evict_where(self, predicate: Callable[[Hashable, Any], bool]):
+        self.invalidations += 1
+        for key in [key for key, (_, value) in self._entries.items() if predicate(key, value)]:
+            del self._entries[key]
+
+    def clear(self):
+        self.invalidations += 1
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachedEmbedder(EmbedderClient):
+    """Embedder wrapper that serves repeated texts from a TTLCache keyed on their SHA-256.
+
+    With `quantize`, vectors are stored as int8 with a per-vector scale, cutting cache memory ~4x
+    at the cost of a small, cosine-preserving rounding error on cache hits.
+    """
+
+    def __init__(self, embedder: EmbedderClient, cache: TTLCache, quantize: bool = False):
+        self.embedder = embedder
+        self.cache = cache
+        self.quantize = quantize
+
+    async def create(
+        self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
+    ) -> list[float]:
+        # Only single texts are cached; token inputs go straight to the wrapped embedder
+        if isinstance(input_data, str):
+            text = input_data
+        elif (
+            isinstance(input_data, list) and len(input_data) == 1 and isinstance(input_data[0], str)
+        ):
+            text = input_data[0]
+        else:
+            return await self.embedder.create(input_data)
+
+        key = _embedding_cache_key(text)
+        embedding = self._get_cached(key)
+        if embedding is not None:
+            return embedding
+
+        embedding = await self.embedder.create(input_data)
+        self._set_cached(key, embedding)
+        return embedding
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        keys = [_embedding_cache_key(text) for text in input_data_list]
+        embeddings = [self._get_cached(key) for key in keys]
+
+        # Positions still needing an embedding, grouped so repeated texts are only embedded once
+        missing: dict[str, list[int]] = {}
+        for i, (key, embedding) in enumerate(zip(keys, embeddings, strict=True)):
+            if embedding is None:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            created = await self.embedder.create_batch(
+                [input_data_list[positions[0]] for positions in missing.values()]
+            )
+            for (key, positions), embedding in zip(missing.items(), created, strict=True):
+                self._set_cached(key, embedding)
+                for i in positions:
+                    embeddings[i] = embedding
+
+        return embeddings  # type: ignore[return-value]
+
+    def stats(self) -> dict[str, Any]:
+        return self.cache.stats()
+
+    def _get_cached(self, key: str) -> list[float] | None:
+        entry = self.cache.get(key)
+        if entry is None or not self.quantize:
+            return entry
+
+        quantized, scale = entry
+        return (quantized.astype(np.float32) * scale).tolist()
+
+    def _set_cached(self, key: str, embedding: list[float]):
+        if not self.quantize:
+            self.cache.set(key, embedding)
+            return
+
+        # Symmetric per-vector quantization: the largest component maps to +/-127. `initial`
+        # keeps np.max from raising on an empty embedding.
+        vector = np.asarray(embedding, dtype=np.float32)
+        scale = float(np.max(np.abs(vector), initial=0.0)) / 127 or 1.0
+        self.cache.set(key, (np.round(vector / scale).astype(np.int8), scale))
+
+
+def _embedding_cache_key(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class SearchCache(TTLCache):
+    """TTLCache for search results that remembers when each group was last invalidated.
+
+    A search records `generation()` before querying the graph and stores its result with
+    `set_if_current`, so a result computed while its groups were being invalidated is dropped
+    instead of being cached for the full TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None):
+        super().__init__(maxsize, ttl)
+        # The `invalidations` count at each group's latest invalidation, bounded like the entries.
+        # Groups no longer tracked count as invalidated at `_forgotten_at`, which can only drop a
+        # result that was in fact still current, never cache a stale one.
+        self._group_invalidated_at: OrderedDict[str, int] = OrderedDict()
+        self._forgotten_at = 0
+
+    def generation(self) -> int:
+        return self.invalidations
+
+    def set_if_current(self, key: tuple[Hashable, ...], value: Any, generation: int):
+        group_ids = key[1]
+        if group_ids is None:
+            # Results searched across all groups are stale after any invalidation
+            invalidated_at = self.invalidations
+        else:
+            invalidated_at = max(
+                self._group_invalidated_at.get(g, self._forgotten_at)
+                for g in group_ids  # type: ignore[attr-defined]
+            )
+        if invalidated_at <= generation:
+            self.set(key, value)
+
+    def invalidate_group(self, group_id: str):
+        # Entries searched across all groups (None) may also contain facts from this group
+        self.evict_where(lambda key, _: key[1] is None or group_id in key[1])  # type: ignore[index]
+        self._group_invalidated_at[group_id] = self.invalidations
+        self._group_invalidated_at.move_to_end(group_id)
+        while len(self._group_invalidated_at) > self.maxsize:
+            _, invalidated_at = self._group_invalidated_at.popitem(last=False)
+            self._forgotten_at = max(self._forgotten_at, invalidated_at)
+
+    def clear(self):
+        super().clear()
+        # Every group is invalidated at once, so none needs tracking on its own
+        self._group_invalidated_at.clear()
+        self._forgotten_at = self.invalidations
+
+
+def search_cache_key(
+    endpoint: str, group_ids: list[str] | None, query: str, *args: Hashable
+) -> tuple[Hashable, ...]:
+    # The group ids always sit in the second slot so writes can evict by group. The query is
+    # hashed since /get-memory queries are whole conversations and would otherwise be kept alive.
+    return (
+        endpoint,
+        frozenset(group_ids) if group_ids else None,
+        hashlib.sha256(query.encode()).hexdigest(),
+        *args,
+    )
+
+
+@lru_cache
+def get_search_cache() -> SearchCache:
+    settings = get_settings()
+    return SearchCache(maxsize=settings.search_cache_size, ttl=settings.search_cache_ttl)
+
+
+def invalidate_group(group_id: str):
+    get_search_cache().invalidate_group(group_id)
+
+
+SearchCacheDep = Annotated[SearchCache, Depends(get_search_cache)]
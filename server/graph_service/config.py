@@ -14,6 +14,17 @@ class Settings(BaseSettings):
     neo4j_uri: str
     neo4j_user: str
     neo4j_password: str
+    neo4j_max_connection_pool_size: int | None = Field(None)
+    neo4j_connection_acquisition_timeout: float | None = Field(None)
+    max_queued_messages: int = Field(10_000)
+    search_cache_size: int = Field(10_000)
+    search_cache_ttl: float = Field(60.0)
+    embedding_cache_size: int = Field(10_000)
+    embedding_cache_quantize: bool = Field(False)
+    edge_cache_size: int = Field(4096)
+    edge_cache_ttl: float = Field(60.0)
+    embedding_batch_size: int = Field(64)
+    embedding_batch_max_latency: float = Field(0.01)
 
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 
@@ -1,5 +1,5 @@
 from .common import Message, Result
-from .ingest import AddEntityNodeRequest, AddMessagesRequest
+from .ingest import AddEntityNodeRequest, AddEntityNodesRequest, AddMessagesRequest
 from .retrieve import FactResult, GetMemoryRequest, GetMemoryResponse, SearchQuery, SearchResults
 
 __all__ = [
@@ -7,6 +7,7 @@ __all__ = [
     'Message',
     'AddMessagesRequest',
     'AddEntityNodeRequest',
+    'AddEntityNodesRequest',
     'SearchResults',
     'FactResult',
     'Result',
@@ -13,3 +13,7 @@ class AddEntityNodeRequest(BaseModel):
     group_id: str = Field(..., description='The group id of the node to add')
     name: str = Field(..., description='The name of the node to add')
     summary: str = Field(default='', description='The summary of the node to add')
+
+
+class AddEntityNodesRequest(BaseModel):
+    nodes: list[AddEntityNodeRequest] = Field(..., description='The nodes to add')
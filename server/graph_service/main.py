@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -5,16 +6,19 @@ from fastapi.responses import JSONResponse
 
 from graph_service.config import get_settings
 from graph_service.routers import ingest, retrieve
-from graph_service.zep_graphiti import initialize_graphiti
+from graph_service.zep_graphiti import create_graphiti
 
 
 @asynccontextmanager
-async def lifespan(_: FastAPI):
+async def lifespan(app: FastAPI):
     settings = get_settings()
-    await initialize_graphiti(settings)
+    # Client construction runs synchronous SDK setup, so keep it off the event loop
+    graphiti = await asyncio.to_thread(create_graphiti, settings)
+    await graphiti.build_indices_and_constraints()
+    app.state.graphiti = graphiti
     yield
     # Shutdown
-    # No need to close Graphiti here, as it's handled per-request
+    await app.state.graphiti.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -1,12 +1,22 @@
 import asyncio
+import math
+import time
 from contextlib import asynccontextmanager
+from datetime import datetime
 from functools import partial
 
-from fastapi import APIRouter, FastAPI, status
-from graphiti_core.nodes import EpisodeType  # type: ignore
+from fastapi import APIRouter, FastAPI, HTTPException, status
+from graphiti_core.nodes import EntityNode, EpisodeType  # type: ignore
 from graphiti_core.utils.maintenance.graph_data_operations import clear_data  # type: ignore
 
-from graph_service.dto import AddEntityNodeRequest, AddMessagesRequest, Message, Result
+from graph_service.cache import get_search_cache, invalidate_group
+from graph_service.config import ZepEnvDep
+from graph_service.dto import (
+    AddEntityNodeRequest,
+    AddEntityNodesRequest,
+    AddMessagesRequest,
+    Result,
+)
 from graph_service.zep_graphiti import ZepGraphitiDep
 
 
@@ -14,16 +24,29 @@ class AsyncWorker:
     def __init__(self):
         self.queue = asyncio.Queue()
         self.task = None
+        self.avg_job_seconds = 0.0
 
     async def worker(self):
         while True:
             try:
                 print(f'Got a job: (size of remaining queue: {self.queue.qsize()})')
                 job = await self.queue.get()
+                started_at = time.monotonic()
                 await job()
+                self._record_job_duration(time.monotonic() - started_at)
             except asyncio.CancelledError:
                 break
 
+    def _record_job_duration(self, seconds: float):
+        # Exponential moving average, used to estimate how long the backlog takes to drain
+        if self.avg_job_seconds == 0.0:
+            self.avg_job_seconds = seconds
+        else:
+            self.avg_job_seconds = 0.8 * self.avg_job_seconds + 0.2 * seconds
+
+    def estimated_wait_seconds(self) -> int:
+        return max(1, math.ceil(self.queue.qsize() * self.avg_job_seconds))
+
     async def start(self):
         self.task = asyncio.create_task(self.worker())
 
@@ -52,20 +75,56 @@ router = APIRouter(lifespan=lifespan)
 async def add_messages(
     request: AddMessagesRequest,
     graphiti: ZepGraphitiDep,
+    settings: ZepEnvDep,
 ):
-    async def add_messages_task(m: Message):
-        await graphiti.add_episode(
-            uuid=m.uuid,
-            group_id=request.group_id,
-            name=m.name,
-            episode_body=f'{m.role or ""}({m.role_type}): {m.content}',
-            reference_time=m.timestamp,
+    if len(request.messages) > settings.max_queued_messages:
+        # Could never fit in the queue, so retrying would not help
+        raise HTTPException(
+            status_code=413,  # Named differently across Starlette versions
+            detail=f'At most {settings.max_queued_messages} messages can be added per request',
+        )
+    if async_worker.queue.qsize() + len(request.messages) > settings.max_queued_messages:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Message processing queue is full',
+            headers={'Retry-After': str(async_worker.estimated_wait_seconds())},
+        )
+
+    group_id = request.group_id
+
+    async def add_messages_task(
+        uuid: str | None,
+        name: str,
+        episode_body: str,
+        reference_time: datetime,
+        source_description: str,
+    ):
+        result = await graphiti.add_episode(
+            uuid=uuid,
+            group_id=group_id,
+            name=name,
+            episode_body=episode_body,
+            reference_time=reference_time,
             source=EpisodeType.message,
-            source_description=m.source_description,
+            source_description=source_description,
         )
+        invalidate_group(group_id)
+        # Ingestion can invalidate existing edges, so drop any cached copies
+        for edge in result.edges:
+            graphiti.edge_cache.pop(edge.uuid)
 
+    # Queue only the fields the job needs, so pending jobs don't keep the request models alive
     for m in request.messages:
-        await async_worker.queue.put(partial(add_messages_task, m))
+        await async_worker.queue.put(
+            partial(
+                add_messages_task,
+                m.uuid,
+                m.name,
+                f'{m.role or ""}({m.role_type}): {m.content}',
+                m.timestamp,
+                m.source_description,
+            )
+        )
 
     return Result(message='Messages added to processing queue', success=True)
 
@@ -84,15 +143,31 @@ async def add_entity_node(
     return node
 
 
+@router.post('/entity-nodes', status_code=status.HTTP_201_CREATED)
+async def add_entity_nodes(
+    request: AddEntityNodesRequest,
+    graphiti: ZepGraphitiDep,
+):
+    nodes = await graphiti.save_entity_nodes(
+        [
+            EntityNode(uuid=n.uuid, group_id=n.group_id, name=n.name, summary=n.summary)
+            for n in request.nodes
+        ]
+    )
+    return nodes
+
+
 @router.delete('/entity-edge/{uuid}', status_code=status.HTTP_200_OK)
 async def delete_entity_edge(uuid: str, graphiti: ZepGraphitiDep):
     await graphiti.delete_entity_edge(uuid)
+    get_search_cache().clear()
     return Result(message='Entity Edge deleted', success=True)
 
 
 @router.delete('/group/{group_id}', status_code=status.HTTP_200_OK)
 async def delete_group(group_id: str, graphiti: ZepGraphitiDep):
     await graphiti.delete_group(group_id)
+    invalidate_group(group_id)
     return Result(message='Group deleted', success=True)
 
 
@@ -107,5 +182,7 @@ async def clear(
     graphiti: ZepGraphitiDep,
 ):
     await clear_data(graphiti.driver)
+    get_search_cache().clear()
+    graphiti.edge_cache.clear()
     await graphiti.build_indices_and_constraints()
     return Result(message='Graph cleared', success=True)
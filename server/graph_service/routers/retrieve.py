@@ -2,33 +2,49 @@ from datetime import datetime, timezone
 
 from fastapi import APIRouter, status
 
+from graph_service.cache import SearchCacheDep, search_cache_key
 from graph_service.dto import (
+    FactResult,
     GetMemoryRequest,
     GetMemoryResponse,
     Message,
     SearchQuery,
     SearchResults,
 )
-from graph_service.zep_graphiti import ZepGraphitiDep, get_fact_result_from_edge
+from graph_service.zep_graphiti import (
+    ZepGraphitiDep,
+    get_fact_result_from_edge,
+    get_fact_results_from_edges,
+)
 
 router = APIRouter()
 
 
 @router.post('/search', status_code=status.HTTP_200_OK)
-async def search(query: SearchQuery, graphiti: ZepGraphitiDep):
+async def search(
+    query: SearchQuery, graphiti: ZepGraphitiDep, cache: SearchCacheDep
+) -> SearchResults:
+    cache_key = search_cache_key('search', query.group_ids, query.query, query.max_facts)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    generation = cache.generation()
     relevant_edges = await graphiti.search(
         group_ids=query.group_ids,
         query=query.query,
         num_results=query.max_facts,
     )
-    facts = [get_fact_result_from_edge(edge) for edge in relevant_edges]
-    return SearchResults(
+    facts = get_fact_results_from_edges(relevant_edges)
+    results = SearchResults(
         facts=facts,
     )
+    cache.set_if_current(cache_key, results, generation)
+    return results
 
 
 @router.get('/entity-edge/{uuid}', status_code=status.HTTP_200_OK)
-async def get_entity_edge(uuid: str, graphiti: ZepGraphitiDep):
+async def get_entity_edge(uuid: str, graphiti: ZepGraphitiDep) -> FactResult:
     entity_edge = await graphiti.get_entity_edge(uuid)
     return get_fact_result_from_edge(entity_edge)
 
@@ -45,19 +61,30 @@ async def get_episodes(group_id: str, last_n: int, graphiti: ZepGraphitiDep):
 async def get_memory(
     request: GetMemoryRequest,
     graphiti: ZepGraphitiDep,
-):
+    cache: SearchCacheDep,
+) -> GetMemoryResponse:
     combined_query = compose_query_from_messages(request.messages)
+    cache_key = search_cache_key(
+        'get-memory', [request.group_id], combined_query, request.max_facts
+    )
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    generation = cache.generation()
     result = await graphiti.search(
         group_ids=[request.group_id],
         query=combined_query,
         num_results=request.max_facts,
     )
-    facts = [get_fact_result_from_edge(edge) for edge in result]
-    return GetMemoryResponse(facts=facts)
+    facts = get_fact_results_from_edges(result)
+    response = GetMemoryResponse(facts=facts)
+    cache.set_if_current(cache_key, response, generation)
+    return response
 
 
 def compose_query_from_messages(messages: list[Message]):
-    combined_query = ''
-    for message in messages:
-        combined_query += f'{message.role_type or ""}({message.role or ""}): {message.content}\n'
-    return combined_query
+    return ''.join(
+        f'{message.role_type or ""}({message.role or ""}): {message.content}\n'
+        for message in messages
+    )
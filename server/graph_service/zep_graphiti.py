@@ -1,22 +1,49 @@
-import logging
 from typing import Annotated
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from graphiti_core import Graphiti  # type: ignore
+from graphiti_core.cross_encoder import CrossEncoderClient, OpenAIRerankerClient  # type: ignore
+from graphiti_core.driver.driver import GraphDriver  # type: ignore
+from graphiti_core.driver.neo4j_driver import Neo4jDriver  # type: ignore
 from graphiti_core.edges import EntityEdge  # type: ignore
-from graphiti_core.errors import EdgeNotFoundError, GroupsEdgesNotFoundError, NodeNotFoundError
-from graphiti_core.llm_client import LLMClient  # type: ignore
+from graphiti_core.embedder import EmbedderClient, OpenAIEmbedder  # type: ignore
+from graphiti_core.errors import EdgeNotFoundError, NodeNotFoundError
+from graphiti_core.llm_client import LLMClient, LLMConfig, OpenAIClient  # type: ignore
 from graphiti_core.nodes import EntityNode, EpisodicNode  # type: ignore
+from graphiti_core.utils.bulk_utils import add_nodes_and_edges_bulk  # type: ignore
+from openai import AsyncOpenAI
 
-from graph_service.config import ZepEnvDep
+from graph_service.batching import BatchingEmbedder
+from graph_service.cache import CachedEmbedder, TTLCache
+from graph_service.config import Settings
 from graph_service.dto import FactResult
 
-logger = logging.getLogger(__name__)
-
 
 class ZepGraphiti(Graphiti):
-    def __init__(self, uri: str, user: str, password: str, llm_client: LLMClient | None = None):
-        super().__init__(uri, user, password, llm_client)
+    def __init__(
+        self,
+        uri: str | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        llm_client: LLMClient | None = None,
+        embedder: EmbedderClient | None = None,
+        cross_encoder: CrossEncoderClient | None = None,
+        graph_driver: GraphDriver | None = None,
+        edge_cache: TTLCache | None = None,
+        openai_client: AsyncOpenAI | None = None,
+    ):
+        super().__init__(
+            uri, user, password, llm_client, embedder, cross_encoder, graph_driver=graph_driver
+        )
+        # HTTP client shared by the LLM, embedder and reranker clients; closed along with the driver
+        self.openai_client = openai_client
+        # Read-through cache for get_entity_edge, keyed on edge uuid; disabled unless provided
+        self.edge_cache = edge_cache if edge_cache is not None else TTLCache(maxsize=0, ttl=None)
+
+    async def close(self):
+        await super().close()
+        if self.openai_client is not None:
+            await self.openai_client.close()
 
     async def save_entity_node(self, name: str, uuid: str, group_id: str, summary: str = ''):
         new_node = EntityNode(
@@ -29,37 +56,48 @@ class ZepGraphiti(Graphiti):
         await new_node.save(self.driver)
         return new_node
 
+    async def save_entity_nodes(self, nodes: list[EntityNode]):
+        if not nodes:
+            return nodes
+
+        # One batched embedding call and one bulk write instead of a round trip of each per node.
+        # Names are normalized as in EntityNode.generate_name_embedding, so a name embeds (and
+        # hits the embedding cache) the same whichever endpoint saved it.
+        name_embeddings = await self.embedder.create_batch(
+            [node.name.replace('\n', ' ') for node in nodes]
+        )
+        for node, name_embedding in zip(nodes, name_embeddings, strict=True):
+            node.name_embedding = name_embedding
+        await add_nodes_and_edges_bulk(self.driver, [], [], nodes, [], self.embedder)
+        return nodes
+
     async def get_entity_edge(self, uuid: str):
+        edge = self.edge_cache.get(uuid)
+        if edge is not None:
+            return edge
+
+        invalidations = self.edge_cache.invalidations
         try:
             edge = await EntityEdge.get_by_uuid(self.driver, uuid)
-            return edge
         except EdgeNotFoundError as e:
             raise HTTPException(status_code=404, detail=e.message) from e
 
-    async def delete_group(self, group_id: str):
-        try:
-            edges = await EntityEdge.get_by_group_ids(self.driver, [group_id])
-        except GroupsEdgesNotFoundError:
-            logger.warning(f'No edges found for group {group_id}')
-            edges = []
+        # Don't cache an edge that a concurrent delete or ingest invalidated while it was loading
+        if self.edge_cache.invalidations == invalidations:
+            self.edge_cache.set(uuid, edge)
+        return edge
 
-        nodes = await EntityNode.get_by_group_ids(self.driver, [group_id])
-
-        episodes = await EpisodicNode.get_by_group_ids(self.driver, [group_id])
-
-        for edge in edges:
-            await edge.delete(self.driver)
-
-        for node in nodes:
-            await node.delete(self.driver)
-
-        for episode in episodes:
-            await episode.delete(self.driver)
+    async def delete_group(self, group_id: str):
+        # Delete in the database by group_id, in batches, rather than loading every edge, node and
+        # episode of the group first; DETACH DELETE removes the group's edges along with its nodes
+        await EntityNode.delete_by_group_id(self.driver, group_id)
+        self.edge_cache.evict_where(lambda _, edge: edge.group_id == group_id)
 
     async def delete_entity_edge(self, uuid: str):
         try:
             edge = await EntityEdge.get_by_uuid(self.driver, uuid)
             await edge.delete(self.driver)
+            self.edge_cache.pop(uuid)
         except EdgeNotFoundError as e:
             raise HTTPException(status_code=404, detail=e.message) from e
 
@@ -71,36 +109,62 @@ class ZepGraphiti(Graphiti):
             raise HTTPException(status_code=404, detail=e.message) from e
 
 
-async def get_graphiti(settings: ZepEnvDep):
-    client = ZepGraphiti(
+def create_graph_driver(settings: Settings) -> GraphDriver:
+    return Neo4jDriver(
         uri=settings.neo4j_uri,
         user=settings.neo4j_user,
         password=settings.neo4j_password,
+        max_connection_pool_size=settings.neo4j_max_connection_pool_size,
+        connection_acquisition_timeout=settings.neo4j_connection_acquisition_timeout,
     )
-    if settings.openai_base_url is not None:
-        client.llm_client.config.base_url = settings.openai_base_url
-    if settings.openai_api_key is not None:
-        client.llm_client.config.api_key = settings.openai_api_key
-    if settings.model_name is not None:
-        client.llm_client.model = settings.model_name
 
-    try:
-        yield client
-    finally:
-        await client.close()
 
-
-async def initialize_graphiti(settings: ZepEnvDep):
-    client = ZepGraphiti(
-        uri=settings.neo4j_uri,
-        user=settings.neo4j_user,
-        password=settings.neo4j_password,
+def create_graphiti(settings: Settings) -> ZepGraphiti:
+    # One AsyncOpenAI, and so one keep-alive connection pool, serves the LLM, embedder and reranker
+    # clients instead of each opening its own connections and TLS sessions to the same API
+    openai_client = AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
+
+    # Entity names repeat heavily across ingests, so embeddings are cached by text; cache misses
+    # from concurrent requests are then coalesced into a single batched embedding call
+    embedder = CachedEmbedder(
+        BatchingEmbedder(
+            OpenAIEmbedder(client=openai_client),
+            max_batch_size=settings.embedding_batch_size,
+            max_latency=settings.embedding_batch_max_latency,
+        ),
+        TTLCache(maxsize=settings.embedding_cache_size, ttl=None),
+        quantize=settings.embedding_cache_quantize,
+    )
+    return ZepGraphiti(
+        llm_client=OpenAIClient(
+            config=LLMConfig(
+                api_key=settings.openai_api_key,
+                model=settings.model_name,
+                base_url=settings.openai_base_url,
+            ),
+            client=openai_client,
+        ),
+        embedder=embedder,
+        # The reranker keeps its own small default model rather than MODEL_NAME
+        cross_encoder=OpenAIRerankerClient(
+            config=LLMConfig(api_key=settings.openai_api_key, base_url=settings.openai_base_url),
+            client=openai_client,
+        ),
+        graph_driver=create_graph_driver(settings),
+        edge_cache=TTLCache(maxsize=settings.edge_cache_size, ttl=settings.edge_cache_ttl),
+        openai_client=openai_client,
     )
-    await client.build_indices_and_constraints()
 
 
-def get_fact_result_from_edge(edge: EntityEdge):
-    return FactResult(
+async def get_graphiti(request: Request) -> ZepGraphiti:
+    # A single client, with its Neo4j pool and LLM/embedder HTTP clients, is shared by every
+    # request. It is created and closed by the app lifespan.
+    return request.app.state.graphiti
+
+
+def get_fact_result_from_edge(edge: EntityEdge) -> FactResult:
+    # The edge fields were already validated when the EntityEdge was built
+    return FactResult.model_construct(
         uuid=edge.uuid,
         name=edge.name,
         fact=edge.fact,
@@ -111,4 +175,8 @@ def get_fact_result_from_edge(edge: EntityEdge):
     )
 
 
+def get_fact_results_from_edges(edges: list[EntityEdge]) -> list[FactResult]:
+    return [get_fact_result_from_edge(edge) for edge in edges]
+
+
 ZepGraphitiDep = Annotated[ZepGraphiti, Depends(get_graphiti)]
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from graph_service.batching import BatchingEmbedder
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.batch_calls: list[list[str]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.error: BaseException | None = None
+        self.drop_last = False
+
+    async def create(self, input_data):
+        return [-1.0]
+
+    async def create_batch(self, input_data_list):
+        self.batch_calls.append(list(input_data_list))
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        embeddings = [[float(len(text))] for text in input_data_list]
+        return embeddings[:-1] if self.drop_last else embeddings
+
+
+@pytest.fixture
+def embedder():
+    return FakeEmbedder()
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full(embedder):
+    batching = BatchingEmbedder(embedder, max_batch_size=2, max_latency=60)
+
+    result = await asyncio.wait_for(
+        asyncio.gather(batching.create('a'), batching.create('bb')), timeout=1
+    )
+
+    assert result == [[1.0], [2.0]]
+    assert embedder.batch_calls == [['a', 'bb']]
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_max_latency(embedder):
+    batching = BatchingEmbedder(embedder, max_batch_size=10, max_latency=0.01)
+
+    result = await asyncio.wait_for(
+        asyncio.gather(batching.create('a'), batching.create(['bb'])), timeout=1
+    )
+
+    assert result == [[1.0], [2.0]]
+    assert embedder.batch_calls == [['a', 'bb']]
+
+
+@pytest.mark.asyncio
+async def test_token_inputs_bypass_batching(embedder):
+    batching = BatchingEmbedder(embedder, max_batch_size=10, max_latency=60)
+
+    assert await asyncio.wait_for(batching.create([1, 2, 3]), timeout=1) == [-1.0]
+    assert embedder.batch_calls == []
+
+
+@pytest.mark.asyncio
+async def test_batch_error_reaches_every_caller(embedder):
+    embedder.error = RuntimeError('embedding service down')
+    batching = BatchingEmbedder(embedder, max_batch_size=2, max_latency=60)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batching.create('a'), batching.create('bb'), return_exceptions=True),
+        timeout=1,
+    )
+
+    assert [str(r) for r in results] == ['embedding service down'] * 2
+
+
+@pytest.mark.asyncio
+async def test_short_batch_result_fails_callers_instead_of_hanging(embedder):
+    embedder.drop_last = True
+    batching = BatchingEmbedder(embedder, max_batch_size=2, max_latency=60)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batching.create('a'), batching.create('bb'), return_exceptions=True),
+        timeout=1,
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_caller_cancelled_mid_batch_does_not_affect_others(embedder):
+    embedder.release.clear()
+    batching = BatchingEmbedder(embedder, max_batch_size=2, max_latency=60)
+
+    cancelled = asyncio.create_task(batching.create('a'))
+    other = asyncio.create_task(batching.create('bb'))
+    while not embedder.batch_calls:
+        await asyncio.sleep(0)
+    cancelled.cancel()
+    embedder.release.set()
+
+    assert await asyncio.wait_for(other, timeout=1) == [2.0]
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert not batching._batch_tasks
+
+
+@pytest.mark.asyncio
+async def test_create_batch_is_split_into_max_batch_size_chunks(embedder):
+    batching = BatchingEmbedder(embedder, max_batch_size=2, max_latency=60)
+    texts = ['a', 'bb', 'ccc', 'dddd', 'eeeee']
+
+    assert await batching.create_batch(texts) == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert embedder.batch_calls == [['a', 'bb'], ['ccc', 'dddd'], ['eeeee']]
+
+
+@pytest.mark.asyncio
+async def test_create_batch_with_no_texts_skips_embedder(embedder):
+    batching = BatchingEmbedder(embedder, max_batch_size=2, max_latency=60)
+
+    assert await batching.create_batch([]) == []
+    assert embedder.batch_calls == []
@@ -0,0 +1,329 @@
+import numpy as np
+import pytest
+
+from graph_service import cache as cache_module
+from graph_service.cache import CachedEmbedder, SearchCache, TTLCache, search_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=None)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set('a', 1)
+
+    clock[0] += 4.9
+    assert cache.get('a') == 1
+    clock[0] += 0.1
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_without_ttl_never_expires(clock):
+    cache = TTLCache(maxsize=10, ttl=None)
+    cache.set('a', 1)
+
+    clock[0] += 1e9
+    assert cache.get('a') == 1
+
+
+@pytest.mark.parametrize('maxsize, ttl', [(0, 60.0), (10, 0.0)])
+def test_ttl_cache_disabled(maxsize, ttl):
+    cache = TTLCache(maxsize=maxsize, ttl=ttl)
+    cache.set('a', 1)
+
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_stats_count_hits_and_misses():
+    cache = TTLCache(maxsize=10, ttl=None)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('a')
+    cache.get('b')
+
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'hit_rate': 2 / 3, 'size': 1}
+
+
+def test_ttl_cache_pop_and_evict_where():
+    cache = TTLCache(maxsize=10, ttl=None)
+    for i in range(4):
+        cache.set(i, i * 10)
+
+    cache.pop(0)
+    cache.pop('missing')
+    cache.evict_where(lambda _, value: value >= 20)
+
+    assert cache.get(1) == 10
+    assert len(cache) == 1
+
+
+def test_search_cache_key_hashes_query():
+    query = 'user(user): hello\n' * 1000
+    key = search_cache_key('get-memory', ['g2', 'g1'], query, 10)
+
+    assert key[0] == 'get-memory'
+    assert key[1] == frozenset({'g1', 'g2'})
+    assert query not in key
+    assert len(key[2]) == 64
+    assert key == search_cache_key('get-memory', ['g1', 'g2'], query, 10)
+    assert key != search_cache_key('get-memory', ['g1', 'g2'], query + '!', 10)
+
+
+def test_search_cache_key_without_groups():
+    assert search_cache_key('search', None, 'q')[1] is None
+    assert search_cache_key('search', [], 'q')[1] is None
+
+
+def test_invalidate_group_evicts_group_and_all_group_entries():
+    cache = SearchCache(maxsize=10, ttl=None)
+    g1 = search_cache_key('search', ['g1'], 'q')
+    g1_g2 = search_cache_key('search', ['g1', 'g2'], 'q')
+    g2 = search_cache_key('search', ['g2'], 'q')
+    all_groups = search_cache_key('search', None, 'q')
+    for key in (g1, g1_g2, g2, all_groups):
+        cache.set(key, 'result')
+
+    cache.invalidate_group('g1')
+
+    assert cache.get(g1) is None
+    assert cache.get(g1_g2) is None
+    assert cache.get(all_groups) is None
+    assert cache.get(g2) == 'result'
+
+
+def test_set_if_current_drops_result_computed_across_invalidation():
+    cache = SearchCache(maxsize=10, ttl=None)
+    key = search_cache_key('search', ['g1'], 'q')
+
+    generation = cache.generation()
+    cache.invalidate_group('g1')
+    cache.set_if_current(key, 'stale', generation)
+
+    assert cache.get(key) is None
+
+
+def test_set_if_current_ignores_invalidation_of_other_groups():
+    cache = SearchCache(maxsize=10, ttl=None)
+    key = search_cache_key('search', ['g1'], 'q')
+
+    generation = cache.generation()
+    cache.invalidate_group('g2')
+    cache.set_if_current(key, 'fresh', generation)
+
+    assert cache.get(key) == 'fresh'
+
+
+def test_set_if_current_all_groups_key_is_stale_after_any_invalidation():
+    cache = SearchCache(maxsize=10, ttl=None)
+    key = search_cache_key('search', None, 'q')
+
+    generation = cache.generation()
+    cache.invalidate_group('g2')
+    cache.set_if_current(key, 'stale', generation)
+
+    assert cache.get(key) is None
+
+
+def test_set_if_current_drops_result_computed_across_clear():
+    cache = SearchCache(maxsize=10, ttl=None)
+    key = search_cache_key('search', ['g1'], 'q')
+
+    generation = cache.generation()
+    cache.clear()
+    cache.set_if_current(key, 'stale', generation)
+
+    assert cache.get(key) is None
+
+
+def test_group_invalidations_are_bounded_by_maxsize():
+    cache = SearchCache(maxsize=3, ttl=None)
+    for i in range(100):
+        cache.invalidate_group(f'g{i}')
+
+    assert len(cache._group_invalidated_at) == 3
+
+
+def test_clear_forgets_group_invalidations():
+    cache = SearchCache(maxsize=10, ttl=None)
+    cache.invalidate_group('g1')
+    cache.invalidate_group('g2')
+
+    cache.clear()
+
+    assert len(cache._group_invalidated_at) == 0
+    key = search_cache_key('search', ['g1'], 'q')
+    cache.set_if_current(key, 'fresh', cache.generation())
+    assert cache.get(key) == 'fresh'
+
+
+def test_set_if_current_drops_result_for_forgotten_group_invalidated_during_search():
+    cache = SearchCache(maxsize=1, ttl=None)
+    key = search_cache_key('search', ['g1'], 'q')
+
+    generation = cache.generation()
+    cache.invalidate_group('g1')
+    # Pushes g1 out of the tracked groups
+    cache.invalidate_group('g2')
+    cache.set_if_current(key, 'stale', generation)
+
+    assert cache.get(key) is None
+
+
+def test_set_if_current_caches_forgotten_group_searched_after_invalidation():
+    cache = SearchCache(maxsize=1, ttl=None)
+    key = search_cache_key('search', ['g1'], 'q')
+    cache.invalidate_group('g1')
+    cache.invalidate_group('g2')
+
+    cache.set_if_current(key, 'fresh', cache.generation())
+
+    assert cache.get(key) == 'fresh'
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.create_calls: list = []
+        self.batch_calls: list[list[str]] = []
+
+    async def create(self, input_data):
+        self.create_calls.append(input_data)
+        if isinstance(input_data, list) and isinstance(input_data[0], str):
+            input_data = input_data[0]
+        return _vector(input_data)
+
+    async def create_batch(self, input_data_list):
+        self.batch_calls.append(list(input_data_list))
+        return [_vector(text) for text in input_data_list]
+
+
+def _vector(input_data) -> list[float]:
+    if isinstance(input_data, str):
+        return [float(len(input_data)), 1.0, -0.5]
+    return [float(len(list(input_data))), 0.0, 0.0]
+
+
+@pytest.fixture
+def embedder():
+    return FakeEmbedder()
+
+
+@pytest.mark.asyncio
+async def test_cached_embedder_create_serves_repeats_from_cache(embedder):
+    cached = CachedEmbedder(embedder, TTLCache(maxsize=10, ttl=None))
+
+    assert await cached.create('alice') == _vector('alice')
+    assert await cached.create(['alice']) == _vector('alice')
+    assert embedder.create_calls == ['alice']
+    assert cached.stats()['hits'] == 1
+    assert cached.stats()['misses'] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_embedder_passes_token_inputs_through(embedder):
+    cached = CachedEmbedder(embedder, TTLCache(maxsize=10, ttl=None))
+    tokens = [1, 2, 3]
+
+    assert await cached.create(tokens) == _vector(tokens)
+    assert await cached.create(tokens) == _vector(tokens)
+    assert embedder.create_calls == [tokens, tokens]
+    assert len(cached.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_embedder_batch_embeds_only_misses(embedder):
+    cached = CachedEmbedder(embedder, TTLCache(maxsize=10, ttl=None))
+    await cached.create('bob')
+
+    result = await cached.create_batch(['alice', 'bob', 'carol'])
+
+    assert result == [_vector('alice'), _vector('bob'), _vector('carol')]
+    assert embedder.batch_calls == [['alice', 'carol']]
+    assert cached.stats()['hits'] == 1
+    assert cached.stats()['misses'] == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_embedder_batch_embeds_repeated_texts_once(embedder):
+    cached = CachedEmbedder(embedder, TTLCache(maxsize=10, ttl=None))
+
+    result = await cached.create_batch(['alice', 'bob', 'alice', 'alice'])
+
+    assert result == [_vector('alice'), _vector('bob'), _vector('alice'), _vector('alice')]
+    assert embedder.batch_calls == [['alice', 'bob']]
+    assert len(cached.cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_embedder_batch_with_all_hits_skips_embedder(embedder):
+    cached = CachedEmbedder(embedder, TTLCache(maxsize=10, ttl=None))
+    await cached.create_batch(['alice', 'bob'])
+
+    assert await cached.create_batch(['bob', 'alice']) == [_vector('bob'), _vector('alice')]
+    assert embedder.batch_calls == [['alice', 'bob']]
+
+
+@pytest.mark.asyncio
+async def test_cached_embedder_with_disabled_cache_always_embeds(embedder):
+    cached = CachedEmbedder(embedder, TTLCache(maxsize=0, ttl=None))
+
+    assert await cached.create_batch(['alice', 'alice']) == [_vector('alice'), _vector('alice')]
+    assert await cached.create('alice') == _vector('alice')
+    assert await cached.create_batch(['alice']) == [_vector('alice')]
+    assert embedder.batch_calls == [['alice'], ['alice']]
+    assert embedder.create_calls == ['alice']
+    assert len(cached.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_quantized_cache_round_trip_preserves_direction_and_length():
+    rng = np.random.default_rng(0)
+    embedding = rng.normal(size=1536).tolist()
+
+    class Embedder(FakeEmbedder):
+        async def create(self, input_data):
+            self.create_calls.append(input_data)
+            return embedding
+
+    embedder = Embedder()
+    cached = CachedEmbedder(embedder, TTLCache(maxsize=10, ttl=None), quantize=True)
+
+    assert await cached.create('alice') == embedding
+    restored = await cached.create('alice')
+
+    assert len(embedder.create_calls) == 1
+    assert len(restored) == len(embedding)
+    a, b = np.asarray(embedding), np.asarray(restored)
+    assert a @ b / (np.linalg.norm(a) * np.linalg.norm(b)) > 0.9999
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('embedding', [[], [0.0, 0.0, 0.0]])
+async def test_quantized_cache_handles_empty_and_zero_embeddings(embedding):
+    class Embedder(FakeEmbedder):
+        async def create(self, input_data):
+            return embedding
+
+    cached = CachedEmbedder(Embedder(), TTLCache(maxsize=10, ttl=None), quantize=True)
+
+    assert await cached.create('alice') == embedding
+    assert await cached.create('alice') == embedding
+    assert cached.stats()['hits'] == 1
@@ -0,0 +1,115 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from graph_service import zep_graphiti
+from graph_service.config import Settings, get_settings
+from graph_service.routers import ingest
+from graph_service.zep_graphiti import ZepGraphiti, get_graphiti
+
+
+def _message(content: str) -> dict:
+    return {'content': content, 'role_type': 'user', 'role': 'user'}
+
+
+@pytest.fixture
+def client():
+    # The router lifespan is not run, so queued jobs stay in the queue where the tests can see them
+    app = FastAPI()
+    app.include_router(ingest.router)
+    app.dependency_overrides[get_graphiti] = lambda: None
+    app.dependency_overrides[get_settings] = lambda: Settings(
+        openai_api_key='test',
+        neo4j_uri='bolt://localhost:7687',
+        neo4j_user='neo4j',
+        neo4j_password='password',
+        max_queued_messages=3,
+    )
+    yield TestClient(app)
+
+    while not ingest.async_worker.queue.empty():
+        ingest.async_worker.queue.get_nowait()
+    ingest.async_worker.avg_job_seconds = 0.0
+
+
+def test_add_messages_queues_one_job_per_message(client):
+    response = client.post(
+        '/messages', json={'group_id': 'g', 'messages': [_message('a'), _message('b')]}
+    )
+
+    assert response.status_code == 202
+    assert ingest.async_worker.queue.qsize() == 2
+
+
+def test_add_messages_returns_503_with_retry_after_when_queue_is_full(client):
+    for _ in range(3):
+        ingest.async_worker.queue.put_nowait(None)
+    ingest.async_worker.avg_job_seconds = 2.0
+
+    response = client.post('/messages', json={'group_id': 'g', 'messages': [_message('a')]})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '6'
+    assert ingest.async_worker.queue.qsize() == 3
+
+
+def test_add_messages_rejects_batch_larger_than_queue_without_retry_after(client):
+    response = client.post(
+        '/messages', json={'group_id': 'g', 'messages': [_message(str(i)) for i in range(4)]}
+    )
+
+    assert response.status_code == 413
+    assert 'Retry-After' not in response.headers
+    assert ingest.async_worker.queue.empty()
+
+
+def test_estimated_wait_uses_moving_average_of_job_durations():
+    worker = ingest.AsyncWorker()
+    worker._record_job_duration(1.0)
+    worker._record_job_duration(6.0)
+    for _ in range(4):
+        worker.queue.put_nowait(None)
+
+    assert worker.avg_job_seconds == pytest.approx(2.0)
+    assert worker.estimated_wait_seconds() == 8
+
+
+def test_estimated_wait_is_at_least_one_second():
+    assert ingest.AsyncWorker().estimated_wait_seconds() == 1
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.batch_calls: list[list[str]] = []
+
+    async def create_batch(self, input_data_list):
+        self.batch_calls.append(list(input_data_list))
+        return [[0.5, 0.5] for _ in input_data_list]
+
+
+def test_add_entity_nodes_embeds_once_and_writes_once(client, monkeypatch):
+    writes = []
+
+    async def add_nodes_and_edges_bulk(driver, episodes, episodic_edges, nodes, edges, embedder):
+        writes.append([node.uuid for node in nodes])
+
+    monkeypatch.setattr(zep_graphiti, 'add_nodes_and_edges_bulk', add_nodes_and_edges_bulk)
+    # Skip Graphiti.__init__, which would connect to Neo4j and build provider clients
+    graphiti = ZepGraphiti.__new__(ZepGraphiti)
+    graphiti.driver = None
+    graphiti.embedder = FakeEmbedder()
+    client.app.dependency_overrides[get_graphiti] = lambda: graphiti
+    nodes = [
+        {'uuid': 'n1', 'group_id': 'g1', 'name': 'Alice', 'summary': 'A person'},
+        {'uuid': 'n2', 'group_id': 'g1', 'name': 'Bob'},
+    ]
+
+    response = client.post('/entity-nodes', json={'nodes': nodes})
+
+    assert response.status_code == 201
+    assert [(n['uuid'], n['name'], n['summary']) for n in response.json()] == [
+        ('n1', 'Alice', 'A person'),
+        ('n2', 'Bob', ''),
+    ]
+    assert graphiti.embedder.batch_calls == [['Alice', 'Bob']]
+    assert writes == [['n1', 'n2']]
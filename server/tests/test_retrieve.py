@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from graphiti_core.edges import EntityEdge  # type: ignore
+
+from graph_service.cache import SearchCache, get_search_cache
+from graph_service.routers import retrieve
+from graph_service.zep_graphiti import get_graphiti
+
+
+def _edge(fact: str) -> EntityEdge:
+    return EntityEdge(
+        group_id='g1',
+        source_node_uuid='source',
+        target_node_uuid='target',
+        created_at=datetime.now(timezone.utc),
+        name='RELATES_TO',
+        fact=fact,
+    )
+
+
+class FakeGraphiti:
+    def __init__(self, cache: SearchCache):
+        self.cache = cache
+        self.searches = 0
+        self.invalidate_during_search = False
+
+    async def search(self, group_ids, query, num_results):
+        self.searches += 1
+        if self.invalidate_during_search:
+            # An ingest for the group finishing while this search is in flight
+            self.cache.invalidate_group('g1')
+        return [_edge(f'fact {self.searches}')]
+
+
+@pytest.fixture
+def search_cache():
+    return SearchCache(maxsize=100, ttl=None)
+
+
+@pytest.fixture
+def graphiti(search_cache):
+    return FakeGraphiti(search_cache)
+
+
+@pytest.fixture
+def client(graphiti, search_cache):
+    app = FastAPI()
+    app.include_router(retrieve.router)
+    app.dependency_overrides[get_graphiti] = lambda: graphiti
+    app.dependency_overrides[get_search_cache] = lambda: search_cache
+    return TestClient(app)
+
+
+def _search(client):
+    response = client.post('/search', json={'group_ids': ['g1'], 'query': 'q'})
+    assert response.status_code == 200
+    return response.json()['facts'][0]['fact']
+
+
+def _get_memory(client):
+    response = client.post(
+        '/get-memory',
+        json={
+            'group_id': 'g1',
+            'center_node_uuid': None,
+            'messages': [{'content': 'hello', 'role_type': 'user', 'role': 'user'}],
+        },
+    )
+    assert response.status_code == 200
+    return response.json()['facts'][0]['fact']
+
+
+@pytest.mark.parametrize('call', [_search, _get_memory])
+def test_repeated_query_is_served_from_cache(client, graphiti, call):
+    assert call(client) == 'fact 1'
+    assert call(client) == 'fact 1'
+    assert graphiti.searches == 1
+
+
+@pytest.mark.parametrize('call', [_search, _get_memory])
+def test_result_is_not_cached_when_group_is_invalidated_during_search(client, graphiti, call):
+    graphiti.invalidate_during_search = True
+    assert call(client) == 'fact 1'
+
+    graphiti.invalidate_during_search = False
+    assert call(client) == 'fact 2'
+    assert graphiti.searches == 2
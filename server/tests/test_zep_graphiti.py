@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from graphiti_core.edges import EntityEdge  # type: ignore
+from graphiti_core.errors import EdgeNotFoundError  # type: ignore
+from graphiti_core.nodes import EntityNode  # type: ignore
+
+from graph_service import zep_graphiti
+from graph_service.cache import TTLCache
+from graph_service.zep_graphiti import ZepGraphiti
+
+
+class FakeEdgeStore:
+    """Stands in for the database behind EntityEdge.get_by_uuid and EntityEdge.delete."""
+
+    def __init__(self):
+        self.edges: dict[str, EntityEdge] = {}
+        self.loads = 0
+        # When cleared, the next load reads the edge and then blocks until it is set again
+        self.release_next_load = asyncio.Event()
+        self.release_next_load.set()
+
+    async def get_by_uuid(self, driver, uuid: str) -> EntityEdge:
+        self.loads += 1
+        edge = self.edges.get(uuid)
+        if not self.release_next_load.is_set():
+            await self.release_next_load.wait()
+        if edge is None:
+            raise EdgeNotFoundError(uuid)
+        return edge
+
+    async def delete(self, edge: EntityEdge, driver):
+        self.edges.pop(edge.uuid, None)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeEdgeStore()
+    monkeypatch.setattr(zep_graphiti.EntityEdge, 'get_by_uuid', store.get_by_uuid)
+    monkeypatch.setattr(
+        zep_graphiti.EntityEdge, 'delete', lambda edge, driver: store.delete(edge, driver)
+    )
+    return store
+
+
+@pytest.fixture
+def graphiti():
+    # Skip Graphiti.__init__, which would connect to Neo4j and build provider clients
+    graphiti = ZepGraphiti.__new__(ZepGraphiti)
+    graphiti.driver = None
+    graphiti.edge_cache = TTLCache(maxsize=10, ttl=None)
+    return graphiti
+
+
+def _add_edge(store: FakeEdgeStore) -> EntityEdge:
+    edge = EntityEdge(
+        group_id='g1',
+        source_node_uuid='source',
+        target_node_uuid='target',
+        created_at=datetime.now(timezone.utc),
+        name='RELATES_TO',
+        fact='fact',
+    )
+    store.edges[edge.uuid] = edge
+    return edge
+
+
+@pytest.mark.asyncio
+async def test_get_entity_edge_is_cached(graphiti, store):
+    edge = _add_edge(store)
+
+    assert await graphiti.get_entity_edge(edge.uuid) is edge
+    assert await graphiti.get_entity_edge(edge.uuid) is edge
+    assert store.loads == 1
+
+
+@pytest.mark.asyncio
+async def test_get_after_delete_returns_404(graphiti, store):
+    edge = _add_edge(store)
+    await graphiti.get_entity_edge(edge.uuid)
+
+    await graphiti.delete_entity_edge(edge.uuid)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await graphiti.get_entity_edge(edge.uuid)
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_racing_delete_does_not_cache_deleted_edge(graphiti, store):
+    edge = _add_edge(store)
+    store.release_next_load.clear()
+    in_flight_get = asyncio.create_task(graphiti.get_entity_edge(edge.uuid))
+    while store.loads == 0:
+        await asyncio.sleep(0)
+
+    store.release_next_load.set()
+    await graphiti.delete_entity_edge(edge.uuid)
+    await in_flight_get
+
+    with pytest.raises(HTTPException) as exc_info:
+        await graphiti.get_entity_edge(edge.uuid)
+    assert exc_info.value.status_code == 404
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.create_calls: list = []
+        self.batch_calls: list[list[str]] = []
+
+    async def create(self, input_data):
+        self.create_calls.append(input_data)
+        return [0.5, 0.5]
+
+    async def create_batch(self, input_data_list):
+        self.batch_calls.append(list(input_data_list))
+        return [[float(i), 0.5] for i in range(len(input_data_list))]
+
+
+@pytest.fixture
+def bulk_writes(monkeypatch):
+    writes: list[list[EntityNode]] = []
+
+    async def add_nodes_and_edges_bulk(driver, episodes, episodic_edges, nodes, edges, embedder):
+        writes.append(list(nodes))
+
+    monkeypatch.setattr(zep_graphiti, 'add_nodes_and_edges_bulk', add_nodes_and_edges_bulk)
+    return writes
+
+
+@pytest.mark.asyncio
+async def test_save_entity_nodes_normalizes_names_like_save_entity_node(graphiti, bulk_writes):
+    graphiti.embedder = FakeEmbedder()
+    node = EntityNode(uuid='n1', group_id='g1', name='Alice\nSmith')
+
+    await graphiti.save_entity_nodes([node])
+
+    assert graphiti.embedder.batch_calls == [['Alice Smith']]
+    assert node.name == 'Alice\nSmith'
+
+
+@pytest.mark.asyncio
+async def test_save_entity_nodes_embeds_in_one_batch_and_writes_once(graphiti, bulk_writes):
+    graphiti.embedder = FakeEmbedder()
+    nodes = [EntityNode(uuid=f'n{i}', group_id='g1', name=f'node {i}') for i in range(3)]
+
+    assert await graphiti.save_entity_nodes(nodes) == nodes
+
+    assert graphiti.embedder.batch_calls == [['node 0', 'node 1', 'node 2']]
+    assert graphiti.embedder.create_calls == []
+    assert bulk_writes == [nodes]
+    assert [node.name_embedding for node in nodes] == [[0.0, 0.5], [1.0, 0.5], [2.0, 0.5]]